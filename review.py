@@ -27,6 +27,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 from openai import OpenAI
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 
 # ----------------------------
@@ -76,6 +78,16 @@ def die(msg: str) -> None:
     print(f"ERROR: {msg}", file=sys.stderr)
     sys.exit(1)
 
+# One keep-alive session for every GitHub call, so the TCP/TLS connection is reused.
+# Idempotent requests are retried on gateway errors; once retries run out the last
+# response is returned (raise_on_status=False) so the status checks below report it.
+_SESSION = requests.Session()
+_SESSION.mount("https://", HTTPAdapter(
+    pool_connections=1,
+    pool_maxsize=4,
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504], raise_on_status=False),
+))
+
 
 # ----------------------------
 # GitHub: fetch PR data
@@ -83,14 +95,14 @@ def die(msg: str) -> None:
 
 def fetch_pr_diff(cfg: Config) -> str:
     url = gh_api_url(cfg.repo, f"/pulls/{cfg.pr_number}")
-    r = requests.get(url, headers=gh_headers(cfg.github_token, accept="application/vnd.github.v3.diff"), timeout=60)
+    r = _SESSION.get(url, headers=gh_headers(cfg.github_token, accept="application/vnd.github.v3.diff"), timeout=60)
     if r.status_code >= 300:
         die(f"Failed to fetch PR diff: {r.status_code} {r.text}")
     return r.text
 
 def fetch_pr_files(cfg: Config, max_files: int = 50) -> List[Dict[str, Any]]:
-    url = gh_api_url(cfg.repo, f"/pulls/{cfg.pr_number}/files?per_page=100")
-    r = requests.get(url, headers=gh_headers(cfg.github_token), timeout=60)
+    url = gh_api_url(cfg.repo, f"/pulls/{cfg.pr_number}/files?per_page={min(max_files, 100)}")
+    r = _SESSION.get(url, headers=gh_headers(cfg.github_token), timeout=60)
     if r.status_code >= 300:
         die(f"Failed to fetch PR files: {r.status_code} {r.text}")
     files = r.json()
@@ -101,8 +113,11 @@ def fetch_pr_files(cfg: Config, max_files: int = 50) -> List[Dict[str, Any]]:
 def build_files_input(files: List[Dict[str, Any]], max_total_chars: int = 120_000) -> str:
     """
     Build a compact representation: filename + status + short patch (if present).
+    Stops adding files once the joined text is over max_total_chars.
     """
+    sep = "\n---\n"
     chunks: List[str] = []
+    size = -len(sep)
     for f in files:
         filename = f.get("filename", "<unknown>")
         status = f.get("status", "<unknown>")
@@ -110,10 +125,12 @@ def build_files_input(files: List[Dict[str, Any]], max_total_chars: int = 120_00
         deletions = f.get("deletions", 0)
         patch = f.get("patch") or ""
         patch = clamp_text(patch, 6000)  # per-file patch clamp
-        chunks.append(
-            f"FILE: {filename}\nSTATUS: {status} (+{additions}/-{deletions})\nPATCH:\n{patch}\n"
-        )
-    joined = "\n---\n".join(chunks)
+        chunk = f"FILE: {filename}\nSTATUS: {status} (+{additions}/-{deletions})\nPATCH:\n{patch}\n"
+        chunks.append(chunk)
+        size += len(sep) + len(chunk)
+        if size > max_total_chars:
+            break  # the clamp below would cut every later file anyway
+    joined = sep.join(chunks)
     return clamp_text(joined, max_total_chars)
 
 
@@ -181,7 +198,7 @@ def call_openai_review(cfg: Config, pr_context: str) -> str:
 def post_pr_comment(cfg: Config, body: str) -> None:
     url = gh_api_url(cfg.repo, f"/issues/{cfg.pr_number}/comments")
     payload = {"body": body}
-    r = requests.post(url, headers=gh_headers(cfg.github_token), json=payload, timeout=60)
+    r = _SESSION.post(url, headers=gh_headers(cfg.github_token), json=payload, timeout=60)
     if r.status_code >= 300:
         die(f"Failed to post PR comment: {r.status_code} {r.text}")
 
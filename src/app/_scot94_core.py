@@ -0,0 +1,241 @@
+"""
+Parsing helpers shared by the scot94_extract*.py scripts (mopen is also used
+by the analysis scripts, so every script maps the .DAT file the same way).
+
+The scripts run from this directory as plain files, so they import it as a
+top-level module:  from _scot94_core import find_slot16_tables, ...
+"""
+
+from __future__ import annotations
+
+import csv
+import mmap
+import re
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# ----------------------------
+# Utility / validation helpers
+# ----------------------------
+
+def mopen(path: Any) -> mmap.mmap:
+    """
+    Map path read-only. The file handle is closed straight away (the mapping
+    keeps its own); use the result as a context manager so the mapping is
+    closed too:  with mopen(path) as data: ...
+    """
+    with open(path, "rb") as f:
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+ALLOWED_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz '-.")
+# the same set as raw bytes, for bytes.translate(None, NAME_BYTES) checks
+NAME_BYTES = "".join(sorted(ALLOWED_CHARS)).encode("ascii")
+# everything except A-Z a-z; deleting these leaves only the letters
+NON_LETTER_BYTES = bytes(c for c in range(256) if not (65 <= c <= 90 or 97 <= c <= 122))
+# bytes that decode to whitespace in CP437 (what str.strip() would remove)
+CP437_SPACE = bytes(c for c in range(256) if bytes([c]).decode("cp437").isspace())
+
+# 1 for byte values that are a valid slot16 length (1..15), 0 otherwise
+SLOT16_LEN_MASK = bytes(1 if 1 <= c <= 15 else 0 for c in range(256))
+# 1 for byte values that can't appear anywhere in a slot's text (neither a
+# name byte nor strippable whitespace), 0 otherwise
+SLOT16_BAD_MASK = bytes(0 if c in NAME_BYTES or c in CP437_SPACE else 1 for c in range(256))
+
+
+def is_printable_name_bytes(b: bytes) -> bool:
+    """ASCII-ish name bytes only: A-Z a-z space apostrophe hyphen dot."""
+    return not b.translate(None, NAME_BYTES)
+
+
+def read_slot16(data: bytes, off: int) -> Optional[str]:
+    """
+    16-byte Pascal-ish slot:
+      [len][text...][padding...]
+    """
+    if off + 16 > len(data):
+        return None
+    # index the length byte and slice just the text, instead of copying the
+    # whole 16-byte block first and slicing it again
+    L = data[off]
+    if not (1 <= L <= 15):
+        return None
+    raw = data[off + 1 : off + 1 + L].strip(CP437_SPACE)
+    # reject on the raw bytes before paying for a decode: only name bytes, and
+    # at least one letter among them (which also rules out an empty slot)
+    if raw.translate(None, NAME_BYTES) or not raw.translate(None, NON_LETTER_BYTES):
+        return None
+    return raw.decode("cp437", errors="ignore")
+
+
+def iter_slot16_tables(data: bytes) -> Iterator[List[Tuple[int, str]]]:
+    """Yield contiguous runs of valid slot16 strings, in file order."""
+    # one bytes view of the input (no copy if it already is bytes; an mmap is
+    # copied once here instead of being sliced repeatedly below)
+    buf = bytes(data)
+    n = max(0, len(buf) - 16)
+    # Only offsets whose first byte is a plausible length can start a slot;
+    # find() jumps straight to the next one instead of stepping byte by byte.
+    mask = bytearray(buf[:n].translate(SLOT16_LEN_MASK))
+    # bad[k] == 1 when buf[k] can't appear in slot text
+    bad = buf.translate(SLOT16_BAD_MASK)
+    i = mask.find(1)
+    while i != -1:
+        # most candidates have a stray byte in their text: reject those with
+        # one bounded find() before paying for a read_slot16 call
+        if bad.find(1, i + 1, i + 1 + buf[i]) != -1:
+            i = mask.find(1, i + 1)
+            continue
+        slots: List[Tuple[int, str]] = []
+        off = i
+        while True:
+            s = read_slot16(buf, off)
+            if s is None:
+                break
+            slots.append((off, s))
+            off += 16
+        if len(slots) >= 8:
+            yield slots
+            i = mask.find(1, off)
+        else:
+            # Each later slot of a short run starts an even shorter run that
+            # ends at the same place, so clear them instead of re-reading them.
+            for o in range(i + 16, min(off, len(mask)), 16):
+                mask[o] = 0
+            i = mask.find(1, i + 1)
+
+
+def find_slot16_tables(data: bytes) -> List[List[Tuple[int, str]]]:
+    """Find contiguous runs of valid slot16 strings."""
+    return list(iter_slot16_tables(data))
+
+
+def find_first_slot16_table(data: bytes) -> Optional[List[Tuple[int, str]]]:
+    """First slot16 table only; stops scanning as soon as it ends."""
+    return next(iter_slot16_tables(data), None)
+
+
+def extract_pascal_strings(
+    data: bytes,
+    min_len: int = 3,
+    max_len: int = 24,
+    start: int = 0,
+    stop: Optional[int] = None,
+) -> List[Tuple[int, str]]:
+    """
+    Scan bytewise for Pascal-like [len][text] strings.
+    Used to recover the packed Team List B.
+
+    Only strings starting in [start, stop) are returned. Bytes before start are
+    still walked (without decoding) so a string straddling start skips ahead
+    exactly as it would in a full scan; nothing after stop is looked at.
+    """
+    out: List[Tuple[int, str]] = []
+    end = len(data) - 2 if stop is None else min(stop, len(data) - 2)
+    # same trick as find_slot16_tables: only visit bytes that are a usable length
+    len_mask = bytes(1 if min_len <= c <= max_len else 0 for c in range(256))
+    mask = data[: max(0, end)].translate(len_mask)
+    i = mask.find(1)
+    while i != -1:
+        L = data[i]
+        if i + 1 + L <= len(data):
+            sbytes = data[i + 1 : i + 1 + L]
+            if is_printable_name_bytes(sbytes):
+                if i >= start and sbytes.translate(None, NON_LETTER_BYTES):
+                    out.append((i, sbytes.decode("cp437", errors="ignore").strip()))
+                i = mask.find(1, i + 1 + L)
+                continue
+        i = mask.find(1, i + 1)
+    return out
+
+
+# ----------------------------
+# Tokenisation for name blobs
+# ----------------------------
+
+NAME_TOKEN_RE = re.compile(r"^[A-Za-z][A-Za-z'\-]{1,23}$")
+
+
+# Character classes for tokenize_mixed, taken from the CP437 table the blob is
+# decoded with, so accented letters split exactly like ASCII ones.
+_CP437_CHARS = bytes(range(256)).decode("cp437")
+_PUNCT = "'-"
+_KEEP = "".join(ch for ch in _CP437_CHARS if ch.isalpha() or ch in _PUNCT)
+_UPPER = "".join(ch for ch in _KEEP if ch.isupper())
+_LOWER = "".join(ch for ch in _KEEP if ch.islower())
+
+# A run of name chars that never continues from a lowercase letter into an
+# uppercase one (the CamelCase boundary between glued surnames). Written as
+# "capitals, then lowercase, then optionally punctuation and again" so the
+# engine needs no per-character lookbehind.
+MIXED_TOKEN_RE = re.compile(
+    "(?=[{k}])[{up}]*[{lo}]*(?:[{p}][{up}]*[{lo}]*)*".format(
+        k=re.escape(_KEEP), up=re.escape(_UPPER + _PUNCT), lo=re.escape(_LOWER), p=re.escape(_PUNCT)
+    )
+)
+
+
+def tokenize_mixed(s: str) -> List[str]:
+    """
+    Tokenise a mixed blob where names are concatenated and/or space separated.
+    Rules:
+      - keep letters, apostrophes, hyphens
+      - split on non-name chars
+      - split CamelCase boundaries (lower->Upper) to break glued surnames
+      - merge Mc + Xxxx and Mac + Xxxx (common Scottish prefixes)
+    """
+    tokens = MIXED_TOKEN_RE.findall(s)
+    n = len(tokens)
+
+    # One pass for both merges: each Mc + X -> McX result is fed straight into
+    # the Mac + X -> MacX rule, so "Mac", "Mc", "Donald" still gives "MacMcDonald"
+    # exactly as running the Mc pass and then the Mac pass did.
+    merged: List[str] = []
+    held_mac = False
+    i = 0
+    while i < n:
+        t = tokens[i]
+        if t == "Mc" and i + 1 < n:
+            t = "Mc" + tokens[i + 1]
+            i += 2
+        else:
+            i += 1
+        if held_mac:
+            merged.append("Mac" + t)
+            held_mac = False
+        elif t == "Mac":
+            held_mac = True
+        else:
+            merged.append(t)
+    if held_mac:
+        merged.append("Mac")
+
+    return merged
+
+
+# ----------------------------
+# Writers
+# ----------------------------
+
+@contextmanager
+def open_csv(path: Path, header: Sequence[str]) -> Iterator[Any]:
+    """Create path, write the header and yield a csv.writer for streaming rows."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.exists():
+        try:
+            path.unlink()
+        except Exception:
+            # fall back to truncating
+            pass
+    with path.open("w", newline="", encoding="utf-8") as f:
+        w = csv.writer(f)
+        w.writerow(header)
+        yield w
+
+
+def write_csv(path: Path, header: Sequence[str], rows: Iterable[Sequence]) -> None:
+    """Write header then rows; each row lists its values in header order."""
+    with open_csv(path, header) as w:
+        w.writerows(rows)
@@ -1,40 +1,51 @@
-from pathlib import Path
+from _scot94_core import mopen
 
 path = "../SCOT-94.DAT"
-data = Path(path).read_bytes()
 
 START = 6          # header appears to be 6 bytes in this file
 RECSIZE = 16       # fixed slot size
 MAXLEN = 15        # max string length stored in 1 byte
 
-names = []
-for i in range(0, 2000):  # 300 is safe; we'll stop when it stops looking like names
-    off = START + i * RECSIZE
-    if off + RECSIZE > len(data):
-        break
-
-    blk = data[off:off + RECSIZE]
-    L = blk[0]
-
-    if 1 <= L <= MAXLEN:
-        s = blk[1:1 + L].decode("cp437", errors="replace")
-    else:
-        # salvage (rare): treat as raw text without length byte
-        s = blk[1:].rstrip(b"\x00 ").decode("cp437", errors="replace")
-
-    # heuristic stop: once we hit non-texty sections, bail out
-    if not any(c.isalpha() for c in s):
-        # if we already collected a decent list, stop
-        if len(names) > 15550:
-            break
-        continue
-
-    names.append(s)
-
-# show a few and confirm key clubs exist
-print("count:", len(names))
-for club in ["Rangers", "Celtic", "Hearts"]:
-    print(club, "->", club in names)
-
-print(names[:30])
-print(names)
+# bytes whose CP437 character is a letter (includes the accented ones above 0x7F)
+ALPHA_BYTES = bytes(b for b in range(256) if bytes([b]).decode("cp437").isalpha())
+
+def slot_names(data):
+    names = []
+    # every record's length byte in one strided slice, instead of a slice per record
+    nrecs = max(0, min(2000, (len(data) - START) // RECSIZE))  # 300 is safe; we'll stop when it stops looking like names
+    lens = data[START:START + nrecs * RECSIZE:RECSIZE]
+    # CP437 is one character per byte: decode the records once, then slice by offset
+    text = str(memoryview(data)[START:START + nrecs * RECSIZE], "cp437", errors="replace")
+    for i, L in enumerate(lens):
+        off = i * RECSIZE
+        end = off + 1 + L if 1 <= L <= MAXLEN else off + RECSIZE
+
+        # heuristic stop: once we hit non-texty sections, bail out
+        # (checked on the raw bytes, so rejected records are never sliced out of text)
+        raw = data[START + off + 1:START + end]
+        if len(raw.translate(None, ALPHA_BYTES)) == len(raw):
+            # if we already collected a decent list, stop
+            if len(names) > 15550:
+                break
+            continue
+
+        if 1 <= L <= MAXLEN:
+            s = text[off + 1:end]
+        else:
+            # salvage (rare): treat as raw text without length byte
+            s = text[off + 1:end].rstrip("\x00 ")
+
+        names.append(s)
+    return names
+
+if __name__ == "__main__":
+    with mopen(path) as data:
+        names = slot_names(data)
+
+    # show a few and confirm key clubs exist
+    print("count:", len(names))
+    for club in ["Rangers", "Celtic", "Hearts"]:
+        print(club, "->", club in names)
+
+    print(names[:30])
+    print(names)
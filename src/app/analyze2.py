@@ -11,22 +11,22 @@ runs = [(m.start(), m.end(), m.group())
 # Pick the run that contains Diamond
 start, end, blob = next(r for r in runs if "Diamond" in r[2])
 
+# an Uppercase that follows a lowercase (CamelCase boundary)
+CAMEL_RE = re.compile(r"(?<=[a-z])[A-Z]")
+
 def split_names(s: str):
-    # split when an Uppercase follows a lowercase (CamelCase boundary)
+    # split at each CamelCase boundary; the regex finds them all in one pass
+    # instead of testing isupper()/islower() on every character
     parts = []
-    cur = s[0]
-    for i, ch in enumerate(s[1:], 1):
-        prev = s[i-1]
-        if ch.isupper() and prev.islower():
-            # don't split MacManus into Mac + Manus
-            if cur.endswith("Mac"):
-                cur += ch
-                continue
-            parts.append(cur)
-            cur = ch
-        else:
-            cur += ch
-    parts.append(cur)
+    start = 0
+    for m in CAMEL_RE.finditer(s):
+        i = m.start()
+        # don't split MacManus into Mac + Manus
+        if s.endswith("Mac", start, i):
+            continue
+        parts.append(s[start:i])
+        start = i
+    parts.append(s[start:])
 
     # merge Mc + Xxxxx back into McXxxxx
     merged = []
@@ -1,40 +1,22 @@
-from pathlib import Path
-import struct
+from _scot94_core import mopen
+from scot94_extract_with_attrs import TEAM_COUNT, TEAM_TABLE_OFFSET, extract_team_attributes_raw
 
 DAT_PATH = "../SCOT-94.DAT"
 
-TEAM_TABLE_OFFSET = 6
-TEAM_COUNT = 64
-
-# Candidate attribute tables
-B1_OFFSET = 0x0C20   # byte
-CAP_OFFSET = 0x0C60  # uint16
-B2_OFFSET = 0x0C80   # byte
-B3_OFFSET = 0x0CC0   # byte
-B4_OFFSET = 0x0CE0   # byte
-
-def read_slot16(data, off):
-    blk = data[off:off+16]
-    L = blk[0]
-    if not (1 <= L <= 15):
-        return None
-    return blk[1:1+L].decode("cp437", "ignore").strip()
-
 def load_teams(data):
+    # one slice covers the whole table; every 16th byte of it is a length
+    tbl = data[TEAM_TABLE_OFFSET:TEAM_TABLE_OFFSET + TEAM_COUNT*16]
     teams = []
-    off = TEAM_TABLE_OFFSET
-    for _ in range(TEAM_COUNT):
-        teams.append(read_slot16(data, off))
-        off += 16
+    for off, L in zip(range(0, len(tbl), 16), tbl[::16]):
+        if not (1 <= L <= 15):
+            teams.append(None)
+            continue
+        teams.append(tbl[off+1:off+1+L].decode("cp437", "ignore").strip())
     return teams
 
-def dump_team(data, teams, name):
-    idx = teams.index(name)
-    b1 = data[B1_OFFSET + idx]
-    cap = struct.unpack_from("<H", data, CAP_OFFSET + idx*2)[0]
-    b2 = data[B2_OFFSET + idx]
-    b3 = data[B3_OFFSET + idx]
-    b4 = data[B4_OFFSET + idx]
+def dump_team(row):
+    # row as yielded by extract_team_attributes_raw (the u16 table is the capacity candidate)
+    idx, name, b1, cap, b2, b3, b4, _ = row
     return {
         "team": name,
         "index": idx,
@@ -46,9 +28,15 @@ def dump_team(data, teams, name):
     }
 
 if __name__ == "__main__":
-    data = Path(DAT_PATH).read_bytes()
-    teams = load_teams(data)
+    with mopen(DAT_PATH) as data:
+        teams = load_teams(data)
+        # every team's attributes come from the same bulk reader the extractor uses
+        rows = list(extract_team_attributes_raw(data, teams))
     print(teams)
+    # name -> first slot index, built once instead of a teams.index() scan per sample
+    idx_of = {}
+    for i, t in enumerate(teams):
+        idx_of.setdefault(t, i)
     samples = [
         "AC Milan",
         "Lazio",
@@ -57,4 +45,4 @@ if __name__ == "__main__":
     ]
 
     for t in samples:
-        print(dump_team(data, teams, t))
\ No newline at end of file
+        print(dump_team(rows[idx_of[t]]))
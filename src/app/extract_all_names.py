@@ -19,9 +19,12 @@ from __future__ import annotations
 import argparse
 import csv
 import re
-from dataclasses import dataclass
+import sys
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable, List, Optional, Sequence, Tuple
+from typing import FrozenSet, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from _scot94_core import mopen
 
 
 # --- minimal built-in first-name set (extend via --firstnames) ---
@@ -41,23 +44,34 @@ DEFAULT_FIRSTNAMES = {
 }
 
 # Long runs of letters/apostrophes/hyphens (typical "name blobs")
-NAME_RUN_RE = re.compile(r"[A-Za-z'\-]{200,}")
+NAME_RUN_RE = re.compile(rb"[A-Za-z'\-]{200,}")
+
+# Output files are written through a 1 MiB buffer
+OUT_BUFSIZE = 1 << 20
+
+# CamelCase boundary: an Upper following a lower
+CAMEL_RE = re.compile(r"(?<=[a-z])[A-Z]")
 
 # Acceptable token characters for "single name" candidates
 TOKEN_RE = re.compile(r"^[A-Za-z][A-Za-z'\-]{1,23}$")
 
+# obvious non-names that appear in football files
+BLACKLIST = frozenset({
+    "Division","Premier","League","Scottish","Reserve","United","City",
+    "Rovers","Athletic","County","Football","Club",
+})
 
-@dataclass(frozen=True)
-class Token:
+
+class Token(NamedTuple):
     value: str
     source: str   # "slot16" or "blob"
     offset: int   # approximate byte/text offset
 
 
-def load_firstnames(path: Optional[str]) -> set[str]:
+def load_firstnames(path: Optional[str]) -> FrozenSet[str]:
     names = set(DEFAULT_FIRSTNAMES)
     if not path:
-        return names
+        return frozenset(names)
     p = Path(path)
     for line in p.read_text(encoding="utf-8", errors="ignore").splitlines():
         s = line.strip()
@@ -65,24 +79,18 @@ def load_firstnames(path: Optional[str]) -> set[str]:
             continue
         # allow "john" or "John"
         names.add(s[:1].upper() + s[1:].lower())
-    return names
+    return frozenset(names)
 
 
 def is_plausible_token(s: str) -> bool:
     s = s.strip()
-    if not (2 <= len(s) <= 24):
-        return False
+    # TOKEN_RE also bounds the length to 2..24
     if not TOKEN_RE.match(s):
         return False
-    # avoid obvious non-names that appear in football files
-    blacklist = {
-        "Division","Premier","League","Scottish","Reserve","United","City",
-        "Rovers","Athletic","County","Football","Club",
-    }
-    if s in blacklist:
+    if s in BLACKLIST:
         return False
     # reject long ALLCAPS blocks (headers)
-    if s.isupper() and len(s) > 5:
+    if len(s) > 5 and s.isupper():
         return False
     return True
 
@@ -90,41 +98,24 @@ def is_plausible_token(s: str) -> bool:
 def split_concatenated_names(blob: str) -> List[str]:
     """
     Split concatenated names at lower->Upper boundaries.
-    Preserve MacXxxx and re-merge Mc + Xxxx if it was split.
+    Preserve MacXxxx and McXxxx.
     """
     if not blob:
         return []
 
     parts: List[str] = []
-    cur = blob[0]
-
-    for i in range(1, len(blob)):
-        ch = blob[i]
-        prev = blob[i - 1]
+    start = 0
 
-        if ch.isupper() and prev.islower():
-            # don't split MacPherson into Mac + Pherson
-            if cur.endswith("Mac") or cur.endswith("Mc"):
-                cur += ch
-                continue
-            parts.append(cur)
-            cur = ch
-        else:
-            cur += ch
-    parts.append(cur)
-
-    # merge Mc + Xxxx back into McXxxx
-    merged: List[str] = []
-    i = 0
-    while i < len(parts):
-        if parts[i] == "Mc" and i + 1 < len(parts) and parts[i + 1][:1].isupper():
-            merged.append("Mc" + parts[i + 1])
-            i += 2
-        else:
-            merged.append(parts[i])
-            i += 1
+    for m in CAMEL_RE.finditer(blob):
+        i = m.start()
+        # don't split MacPherson into Mac + Pherson (nor McXxxx, so no re-merge is needed)
+        if blob.endswith(("Mac", "Mc"), start, i):
+            continue
+        parts.append(blob[start:i])
+        start = i
+    parts.append(blob[start:])
 
-    return merged
+    return parts
 
 
 def extract_slot16_tokens(data: bytes, start: int = 0, recsize: int = 16) -> Iterable[Token]:
@@ -133,30 +124,34 @@ def extract_slot16_tokens(data: bytes, start: int = 0, recsize: int = 16) -> Ite
     Many DOS sports files store strings as: [len][text...][padding]
     """
     maxlen = recsize - 1
-    for off in range(start, len(data) - recsize + 1, recsize):
-        blk = data[off:off + recsize]
-        L = blk[0]
-        if not (1 <= L <= maxlen):
-            continue
-        raw = blk[1:1 + L]
-        try:
-            s = raw.decode("cp437", errors="ignore").strip()
-        except Exception:
-            continue
-        
+    nrecs = max(0, (len(data) - start) // recsize)
+    stop = start + nrecs * recsize
+    # Pull every length byte with one strided slice and map valid lengths to 1,
+    # so rejected records are skipped by find() without touching their bytes.
+    valid = bytes(1 if 1 <= c <= maxlen else 0 for c in range(256))
+    mask = data[start:stop:recsize].translate(valid)
+    # CP437 maps every byte to exactly one character, so decode the region once
+    # and slice each record's text out of it by byte offset.
+    text = str(memoryview(data)[start:stop], "cp437", errors="ignore")
+    k = mask.find(1)
+    while k != -1:
+        rel = k * recsize
+        k = mask.find(1, k + 1)
+        L = data[start + rel]
+        s = text[rel + 1:rel + 1 + L].strip()
+
         # Often these are single tokens (club names, surnames, etc.)
         if is_plausible_token(s):
-            print("Read: "+s)
-            yield Token(s, "slot16", off)
+            yield Token(s, "slot16", start + rel)
 
 
-def extract_blob_tokens(text: str) -> Iterable[Token]:
+def extract_blob_tokens(data: bytes) -> Iterable[Token]:
     """
     Find long A-Za-z'- runs and split into tokens.
-    Offset is text-index (not exact byte offset), but useful for debugging.
+    Runs are matched on the raw bytes, so the offset is the run's byte offset.
     """
-    for m in NAME_RUN_RE.finditer(text):
-        blob = m.group()
+    for m in NAME_RUN_RE.finditer(data):
+        blob = m.group().decode("ascii")
         base = m.start()
         for t in split_concatenated_names(blob):
             t = t.strip()
@@ -164,7 +159,7 @@ def extract_blob_tokens(text: str) -> Iterable[Token]:
                 yield Token(t, "blob", base)
 
 
-def infer_pairs(tokens: Sequence[Token], firstnames: set[str]) -> Tuple[List[Tuple[str, str, str, int]], List[Token]]:
+def infer_pairs(tokens: Sequence[Token], firstnames: FrozenSet[str]) -> Tuple[List[Tuple[str, str, str, int]], List[Token]]:
     """
     Heuristic pairing:
       - If token[i] is a known first name and token[i+1] looks like a surname -> pair.
@@ -176,7 +171,9 @@ def infer_pairs(tokens: Sequence[Token], firstnames: set[str]) -> Tuple[List[Tup
     i = 0
     while i < len(tokens):
         t = tokens[i]
-        v = t.value[:1].upper() + t.value[1:]  # normalise case a bit
+        v = t.value
+        if not v[:1].isupper():
+            v = v[:1].upper() + v[1:]  # normalise case a bit
 
         if v in firstnames and i + 1 < len(tokens):
             nxt = tokens[i + 1]
@@ -200,21 +197,23 @@ def main() -> None:
     ap.add_argument("--minrun", type=int, default=200, help="Min length of alpha-run to treat as blob (default: 200)")
     ap.add_argument("--pairs-out", default="names_pairs.csv", help="CSV output for inferred pairs")
     ap.add_argument("--singles-out", default="names_singles.txt", help="Text output for unpaired tokens")
+    ap.add_argument("--verbose", action="store_true", help="Print every token read from the 16-byte slots")
     args = ap.parse_args()
 
     global NAME_RUN_RE
-    NAME_RUN_RE = re.compile(rf"[A-Za-z'\-]{{{args.minrun},}}")
+    NAME_RUN_RE = re.compile(rb"[A-Za-z'\-]{%d,}" % args.minrun)
 
-    data = Path(args.input).read_bytes()
-    text = data.decode("cp437", errors="ignore")
     firstnames = load_firstnames(args.firstnames)
 
     # Extract tokens from both encodings
-    slot_tokens = list(extract_slot16_tokens(data, start=args.slot_start))
-    blob_tokens = list(extract_blob_tokens(text))
+    with mopen(args.input) as data:
+        slot_tokens = list(extract_slot16_tokens(data, start=args.slot_start))
+        if args.verbose:
+            sys.stdout.writelines(f"Read: {t.value}\n" for t in slot_tokens)
+        blob_tokens = list(extract_blob_tokens(data))
 
     # Combine while keeping rough file order for better pairing
-    all_tokens = sorted(slot_tokens + blob_tokens, key=lambda t: t.offset)
+    all_tokens = sorted(slot_tokens + blob_tokens, key=attrgetter("offset"))
 
     # Infer pairs
     pairs, singles = infer_pairs(all_tokens, firstnames)
@@ -238,15 +237,13 @@ def main() -> None:
         singles_unique.append(s)
 
     # Write outputs
-    with open(args.pairs_out, "w", newline="", encoding="utf-8") as f:
+    with open(args.pairs_out, "w", newline="", encoding="utf-8", buffering=OUT_BUFSIZE) as f:
         w = csv.writer(f)
         w.writerow(["first", "last", "source", "offset"])
         w.writerows(pairs_unique)
 
-    Path(args.singles_out).write_text(
-        "\n".join(sorted((t.value for t in singles_unique), key=lambda x: x.lower())) + "\n",
-        encoding="utf-8"
-    )
+    with open(args.singles_out, "w", encoding="utf-8", buffering=OUT_BUFSIZE) as f:
+        f.writelines(v + "\n" for v in sorted((t.value for t in singles_unique), key=str.lower))
 
     print(f"Total tokens: {len(all_tokens)}")
     print(f"Inferred pairs: {len(pairs_unique)} -> {args.pairs_out}")
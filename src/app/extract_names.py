@@ -3,8 +3,8 @@
 Generic extractor for player/staff names from old DOS-era binary .DAT files.
 
 Strategy:
-1) Decode bytes using CP437 (DOS Western) with errors ignored.
-2) Find long runs of [A-Za-z'-] (these often store concatenated surnames).
+1) Find long runs of [A-Za-z'-] bytes (these often store concatenated surnames).
+2) Decode just those runs (CP437, DOS Western, by default).
 3) Split those runs into names using CamelCase boundaries (lower->upper transitions),
    with heuristics for Mc/Mac.
 4) Filter improbable tokens and deduplicate.
@@ -19,8 +19,22 @@ from collections import Counter
 from pathlib import Path
 from typing import Iterable, List
 
+from _scot94_core import mopen
 
-NAME_RUN_RE = re.compile(r"[A-Za-z'\-]{200,}")  # adjust threshold if needed
+
+NAME_RUN_RE = re.compile(rb"[A-Za-z'\-]{200,}")  # adjust threshold if needed
+
+# Output files are written through a 1 MiB buffer
+OUT_BUFSIZE = 1 << 20
+
+# CamelCase boundary: an Upper following a lower
+CAMEL_RE = re.compile(r"(?<=[a-z])[A-Z]")
+
+# Common false positives in football data files (tweak as you discover more)
+BLACKLIST = frozenset({
+    "Division", "Premier", "League", "Scottish", "Reserve", "United", "City",
+    "FC", "AFC", "Rovers", "Athletic", "County",
+})
 
 
 def split_concatenated_names(blob: str) -> List[str]:
@@ -33,37 +47,31 @@ def split_concatenated_names(blob: str) -> List[str]:
     if not blob:
         return []
 
-    parts: List[str] = []
-    cur = blob[0]
-
-    for i in range(1, len(blob)):
-        ch = blob[i]
-        prev = blob[i - 1]
-
-        # CamelCase boundary: a new name often begins at Upper following lower
-        if ch.isupper() and prev.islower():
-            # Heuristic: avoid splitting "MacPherson" into "Mac" + "Pherson"
-            if (cur.endswith("Mac") or cur.endswith("Mc"))and len(cur) >= 3:
-                cur += ch
-                continue
-
-            parts.append(cur)
-            cur = ch
-        else:
-            cur += ch
-
-    parts.append(cur)
-
-    # Heuristic: merge Mc + Xxxxx back into McXxxxx (when split as "Mc" and "Naughton")
     merged: List[str] = []
-    i = 0
-    while i < len(parts):
-        if parts[i] == "Mc" and i + 1 < len(parts) and parts[i + 1][:1].isupper():
-            merged.append("Mc" + parts[i + 1])
-            i += 2
+    start = 0
+    # Heuristic: merge Mc + Xxxxx back into McXxxxx (when split as "Mc" and "Naughton").
+    # Done as parts are cut: a lone "Mc" is held back and prefixed to the next part.
+    mc = False
+
+    # CamelCase boundary: a new name often begins at Upper following lower
+    for m in CAMEL_RE.finditer(blob):
+        i = m.start()
+        # Heuristic: avoid splitting "MacPherson" into "Mac" + "Pherson"
+        if i - start >= 3 and blob.endswith(("Mac", "Mc"), start, i):
+            continue
+
+        part = blob[start:i]
+        start = i
+        if mc:
+            merged.append("Mc" + part)
+            mc = False
+        elif part == "Mc":
+            mc = True
         else:
-            merged.append(parts[i])
-            i += 1
+            merged.append(part)
+
+    part = blob[start:]
+    merged.append("Mc" + part if mc else part)
 
     return merged
 
@@ -77,38 +85,40 @@ def is_plausible_name(token: str) -> bool:
         return False
 
     # Must contain at least one letter
-    if not any(c.isalpha() for c in t):
+    if not any(map(str.isalpha, t)):
         return False
 
     # Reject tokens with weird punctuation patterns
     if "--" in t or "''" in t:
         return False
 
-    # Common false positives in football data files (tweak as you discover more)
-    blacklist = {
-        "Division", "Premier", "League", "Scottish", "Reserve", "United", "City",
-        "FC", "AFC", "Rovers", "Athletic", "County",
-    }
-    if t in blacklist:
+    if t in BLACKLIST:
         return False
 
     # Avoid ALLCAPS chunks (often headers) unless short (e.g., "O'Neil" isn't all caps)
-    if t.isupper() and len(t) > 5:
+    if len(t) > 5 and t.isupper():
         return False
 
     return True
 
 
-def extract_name_candidates(text: str) -> Iterable[str]:
+def extract_name_runs(data: bytes, encoding: str = "cp437") -> Iterable[List[str]]:
     """
-    Find long alpha runs and split them into candidate names.
+    Find long alpha runs and split each one into its list of candidate names.
+    The runs are matched on the raw bytes; only the matches get decoded.
     """
-    for m in NAME_RUN_RE.finditer(text):
-        blob = m.group()
+    for m in NAME_RUN_RE.finditer(data):
+        blob = m.group().decode(encoding, errors="ignore")
         # Some runs might be genuine sentences; we still try splitting
-        for token in split_concatenated_names(blob):
-            if is_plausible_name(token):
-                yield token
+        yield list(filter(is_plausible_name, split_concatenated_names(blob)))
+
+
+def extract_name_candidates(data: bytes, encoding: str = "cp437") -> Iterable[str]:
+    """
+    Find long alpha runs and split them into candidate names.
+    """
+    for names in extract_name_runs(data, encoding):
+        yield from names
 
 
 def main() -> None:
@@ -121,27 +131,27 @@ def main() -> None:
     args = ap.parse_args()
 
     global NAME_RUN_RE
-    NAME_RUN_RE = re.compile(rf"[A-Za-z'\-]{{{args.minrun},}}")
-
-    data = Path(args.input).read_bytes()
-
-    print("Opened file:"+args.input)
+    NAME_RUN_RE = re.compile(rb"[A-Za-z'\-]{%d,}" % args.minrun)
 
-    # Decode using DOS CP437; ignore undecodable bytes (common in mixed binary/text formats)
-    text = data.decode(args.encoding, errors="ignore")
+    with mopen(args.input) as data:
+        print("Opened file:"+args.input)
 
-    counts = Counter(extract_name_candidates(text))
+        # Scan the raw bytes; name runs are decoded individually (CP437 by default)
+        counts: Counter = Counter()
+        for names in extract_name_runs(data, args.encoding):
+            counts.update(names)
 
     # De-duplicate, sort by frequency desc then alphabetically
     items = sorted(counts.items(), key=lambda kv: (-kv[1], kv[0].lower()))
 
     # Write plain list
     out_path = Path(args.out)
-    out_path.write_text("\n".join([name for name, _ in items]) + "\n", encoding="utf-8")
+    with out_path.open("w", encoding="utf-8", buffering=OUT_BUFSIZE) as f:
+        f.writelines(name + "\n" for name, _ in items)
 
     # Write CSV with counts
     csv_path = Path(args.csv)
-    with csv_path.open("w", newline="", encoding="utf-8") as f:
+    with csv_path.open("w", newline="", encoding="utf-8", buffering=OUT_BUFSIZE) as f:
         w = csv.writer(f)
         w.writerow(["name", "count"])
         w.writerows(items)
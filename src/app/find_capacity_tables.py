@@ -1,6 +1,8 @@
-from pathlib import Path
 import struct
-import itertools
+from bisect import bisect_left
+from collections import deque
+
+from _scot94_core import mopen
 
 DAT_PATH = "../SCOT-94.DAT"
 TEAM_COUNT = 64
@@ -19,74 +21,130 @@ KNOWN = {
     # rotor_index: 40000,
 }
 
-data = Path(DAT_PATH).read_bytes()
 N = TEAM_COUNT
 
-def table_byte(off: int):
-    return data[off:off+N] if off+N <= len(data) else None
+# Scoring only ever looks at the KNOWN points, so a candidate is rejected once
+# its summed error reaches this limit (s < 500  <=>  err < LIMIT).
+LIMIT = 500 * max(1, len(KNOWN))
+
+def window_distinct(data, n: int):
+    """len(set(data[off:off+n])) for every off, in one pass (rolling byte histogram)."""
+    buf = memoryview(data)
+    counts = [0] * 256
+    distinct = 0
+    out = []
+    for j, b in enumerate(buf):
+        if counts[b] == 0:
+            distinct += 1
+        counts[b] += 1
+        if j >= n:
+            old = buf[j - n]
+            counts[old] -= 1
+            if counts[old] == 0:
+                distinct -= 1
+        if j >= n - 1:
+            out.append(distinct)
+    return out
 
-def table_u16(off: int):
-    if off + 2*N > len(data): return None
-    return list(struct.unpack_from("<" + "H"*N, data, off))
+def decode_words(data, size: int, code: str):
+    """Decode the whole file as little-endian words, once per byte alignment.
+    A table at byte offset `off` is then words[off % size][off // size:][:N].
+    Alignments past the end of a tiny buffer are skipped (unpack_from would raise)."""
+    return [struct.unpack_from("<" + code * ((len(data) - a) // size), data, a)
+            for a in range(min(size, len(data) + 1))]
 
-def table_u32(off: int):
-    if off + 4*N > len(data): return None
-    return list(struct.unpack_from("<" + "I"*N, data, off))
+def window_max(vals, n: int):
+    """max(vals[j:j+n]) for every j, in one pass (monotonic deque)."""
+    out = []
+    q = deque()
+    for j, v in enumerate(vals):
+        while q and vals[q[-1]] <= v:
+            q.pop()
+        q.append(j)
+        if q[0] <= j - n:
+            q.popleft()
+        if j >= n - 1:
+            out.append(vals[q[0]])
+    return out
 
-def score(pred):
-    # mean absolute error over known points
+def score_at(vals, base: int, k: int = 1):
+    # mean absolute error over known points, for the table vals[base:base+N] * k
     err = 0
     for idx, cap in KNOWN.items():
-        err += abs(pred[idx] - cap)
+        err += abs(vals[base + idx] * k - cap)
     return err / max(1, len(KNOWN))
 
-best = []
-
-# 1) Try pairs of byte tables as low/high: cap = lo + 256*hi
-# Scan a reasonable region first (you can widen later)
-for lo_off in range(0, len(data)-N, 1):
-    lo = table_byte(lo_off)
-    if lo is None: break
-    # quick filter: does lo have enough variation?
-    if len(set(lo)) < 8:
-        continue
-
-    for hi_off in range(max(0, lo_off-2048), min(len(data)-N, lo_off+2048), 1):
-        hi = table_byte(hi_off)
-        if hi is None: continue
-        if len(set(hi)) < 4:
+def score_lo_hi(data, lo_off: int, hi_off: int):
+    # mean absolute error over known points, for lo + 256*hi
+    err = 0
+    for idx, cap in KNOWN.items():
+        err += abs(data[lo_off + idx] + 256 * data[hi_off + idx] - cap)
+    return err / max(1, len(KNOWN))
+
+def hi_error_bound(data, off: int) -> int:
+    # lowest summed error any lo table (0..255 per entry) can reach with this hi table
+    err = 0
+    for idx, cap in KNOWN.items():
+        rem = cap - 256 * data[off + idx]
+        err += -rem if rem < 0 else max(0, rem - 255)
+    return err
+
+def find_candidates(data):
+    """Score every candidate table layout against KNOWN; best (lowest error) first."""
+    best = []
+
+    # 1) Try pairs of byte tables as low/high: cap = lo + 256*hi
+    # Scan a reasonable region first (you can widen later)
+    # Usable hi tables don't depend on lo_off, so find them once up front.
+    distinct = window_distinct(data, N)
+    hi_offs = [off for off in range(0, len(data)-N)
+               if distinct[off] >= 4 and hi_error_bound(data, off) < LIMIT]
+
+    for lo_off in range(0, len(data)-N, 1):
+        # quick filter: does lo have enough variation?
+        if distinct[lo_off] < 8:
             continue
 
-        pred = [lo[i] + 256*hi[i] for i in range(N)]
-        s = score(pred)
-        if s < 500:  # threshold; tighten once you add more KNOWN points
-            best.append(("byte_lo_hi", lo_off, hi_off, s))
-
-# 2) Try uint16 tables with common scale factors
-scales = [1, 5, 10, 20, 25, 50, 100]
-for off in range(0, len(data)-2*N, 1):
-    t = table_u16(off)
-    if t is None: break
-    # filter
-    if max(t) < 200:  # too small
-        continue
-    for k in scales:
-        pred = [v * k for v in t]
-        s = score(pred)
+        lo_hi = min(len(data)-N, lo_off+2048)
+        for j in range(bisect_left(hi_offs, max(0, lo_off-2048)), len(hi_offs)):
+            hi_off = hi_offs[j]
+            if hi_off >= lo_hi: break
+
+            s = score_lo_hi(data, lo_off, hi_off)
+            if s < 500:  # threshold; tighten once you add more KNOWN points
+                best.append(("byte_lo_hi", lo_off, hi_off, s))
+
+    # 2) Try uint16 tables with common scale factors
+    scales = [1, 5, 10, 20, 25, 50, 100]
+    u16 = decode_words(data, 2, "H")
+    u16_max = [window_max(w, N) for w in u16]
+    for off in range(0, len(data)-2*N, 1):
+        a, j = off % 2, off // 2
+        # filter
+        if u16_max[a][j] < 200:  # too small
+            continue
+        for k in scales:
+            s = score_at(u16[a], j, k)
+            if s < 500:
+                best.append((f"u16_x{k}", off, None, s))
+
+    # 3) Try uint32 tables directly (rare but possible)
+    u32 = decode_words(data, 4, "I")
+    u32_max = [window_max(w, N) for w in u32]
+    for off in range(0, len(data)-4*N, 1):
+        a, j = off % 4, off // 4
+        if u32_max[a][j] < 1000:
+            continue
+        s = score_at(u32[a], j)
         if s < 500:
-            best.append((f"u16_x{k}", off, None, s))
-
-# 3) Try uint32 tables directly (rare but possible)
-for off in range(0, len(data)-4*N, 1):
-    t = table_u32(off)
-    if t is None: break
-    if max(t) < 1000:
-        continue
-    s = score(t)
-    if s < 500:
-        best.append(("u32", off, None, s))
-
-best.sort(key=lambda x: x[3])
-print("Top candidates:")
-for row in best[:20]:
-    print(row)
\ No newline at end of file
+            best.append(("u32", off, None, s))
+
+    best.sort(key=lambda x: x[3])
+    return best
+
+if __name__ == "__main__":
+    with mopen(DAT_PATH) as data:
+        best = find_candidates(data)
+    print("Top candidates:")
+    for row in best[:20]:
+        print(row)
\ No newline at end of file
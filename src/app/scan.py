@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Run the exploratory scans over a DOS-era .DAT file in one go.
+
+The file is memory-mapped once and the same buffer is handed to each pass,
+instead of every script opening and reading the file on its own:
+  - 16-byte slot strings          (analyze.slot_names)
+  - concatenated name blobs       (extract_names.extract_name_candidates)
+  - capacity table candidates     (find_capacity_tables.find_candidates)
+
+Run:
+  python scan.py ../SCOT-94.DAT
+"""
+
+from __future__ import annotations
+
+import argparse
+from collections import Counter
+from typing import Dict, List
+
+from _scot94_core import mopen
+from analyze import slot_names
+from extract_names import extract_name_candidates
+from find_capacity_tables import find_candidates
+
+
+def scan(data: bytes) -> Dict[str, List]:
+    """Run all three passes over one buffer."""
+    return {
+        "slot_names": slot_names(data),
+        "blob_names": list(extract_name_candidates(data)),
+        "capacity_candidates": find_candidates(data),
+    }
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Run the slot, name-blob and capacity-table scans over one mapping of a .DAT file.")
+    ap.add_argument("input", help="Path to .DAT file")
+    args = ap.parse_args()
+
+    with mopen(args.input) as data:
+        res = scan(data)
+
+    print(f"Slot strings: {len(res['slot_names'])}")
+    print(f"Blob names: {len(Counter(res['blob_names']))} unique")
+    print("Top capacity candidates:")
+    for row in res["capacity_candidates"][:20]:
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
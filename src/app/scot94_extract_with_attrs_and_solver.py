@@ -27,12 +27,23 @@ This is pragmatic reverse engineering. The team-attribute export is intentionall
 
 from __future__ import annotations
 
-import csv
-import re
+import heapq
 import struct
 import sys
+from collections import deque
+from operator import itemgetter
 from pathlib import Path
-from typing import List, Optional, Tuple, Dict
+from typing import Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from _scot94_core import (
+    NAME_TOKEN_RE,
+    extract_pascal_strings,
+    find_first_slot16_table,
+    mopen,
+    open_csv,
+    tokenize_mixed,
+    write_csv,
+)
 
 # ----------------------------
 # Constants (empirically derived)
@@ -66,185 +77,50 @@ ATTR_B2_OFFSET = 0x0C80  # 64 x u8
 ATTR_B3_OFFSET = 0x0CC0  # 64 x u8
 ATTR_B4_OFFSET = 0x0CE0  # 64 x u8 (often ASCII-ish)
 
-ALLOWED_CHARS = set("ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz '-.")
-NAME_TOKEN_RE = re.compile(r"^[A-Za-z][A-Za-z'\-]{1,23}$")
-
-
-# ----------------------------
-# Parsing helpers
-# ----------------------------
-
-def is_printable_name_bytes(b: bytes) -> bool:
-    """ASCII-ish name bytes only: A-Z a-z space apostrophe hyphen dot."""
-    for c in b:
-        if (65 <= c <= 90) or (97 <= c <= 122) or (c in (32, 39, 45, 46)):
-            continue
-        return False
-    return True
-
-
-def read_slot16(data: bytes, off: int) -> Optional[str]:
-    """16-byte Pascal-ish slot: [len][text...][padding...]"""
-    if off + 16 > len(data):
-        return None
-    blk = data[off : off + 16]
-    L = blk[0]
-    if not (1 <= L <= 15):
-        return None
-    raw = blk[1 : 1 + L]
-    s = raw.decode("cp437", errors="ignore").strip()
-    if not s or not any(ch.isalpha() for ch in s):
-        return None
-    if any(ch not in ALLOWED_CHARS for ch in s):
-        return None
-    return s
-
-
-def find_slot16_tables(data: bytes) -> List[List[Tuple[int, str]]]:
-    """Find contiguous runs of valid slot16 strings."""
-    tables: List[List[Tuple[int, str]]] = []
-    i = 0
-    while i < len(data) - 16:
-        slots: List[Tuple[int, str]] = []
-        off = i
-        while True:
-            s = read_slot16(data, off)
-            if s is None:
-                break
-            slots.append((off, s))
-            off += 16
-        if len(slots) >= 8:
-            tables.append(slots)
-            i = off
-        else:
-            i += 1
-    return tables
-
-
-def extract_pascal_strings(data: bytes, min_len: int = 3, max_len: int = 24) -> List[Tuple[int, str]]:
-    """Scan bytewise for Pascal-like [len][text] strings."""
-    out: List[Tuple[int, str]] = []
-    i = 0
-    while i < len(data) - 2:
-        L = data[i]
-        if min_len <= L <= max_len and i + 1 + L <= len(data):
-            sbytes = data[i + 1 : i + 1 + L]
-            if is_printable_name_bytes(sbytes):
-                s = sbytes.decode("cp437", errors="ignore").strip()
-                if any(ch.isalpha() for ch in s):
-                    out.append((i, s))
-                i += 1 + L
-                continue
-        i += 1
-    return out
-
-
-def tokenize_mixed(s: str) -> List[str]:
-    """
-    Tokenise a mixed blob where names are concatenated and/or space separated.
-    Rules:
-      - keep letters, apostrophes, hyphens
-      - split on non-name chars
-      - split CamelCase boundaries (lower->Upper) to break glued surnames
-      - merge Mc + Xxxx and Mac + Xxxx
-    """
-    tokens: List[str] = []
-    cur = ""
-
-    def flush() -> None:
-        nonlocal cur
-        if cur:
-            tokens.append(cur)
-            cur = ""
-
-    for ch in s:
-        if ch == " ":
-            flush()
-            continue
-        if not (ch.isalpha() or ch in ("'", "-")):
-            flush()
-            continue
-        if cur and ch.isupper() and cur[-1].islower():
-            flush()
-            cur = ch
-        else:
-            cur += ch
-    flush()
-
-    # merge Mc + X
-    merged: List[str] = []
-    i = 0
-    while i < len(tokens):
-        if tokens[i] == "Mc" and i + 1 < len(tokens):
-            merged.append("Mc" + tokens[i + 1])
-            i += 2
-        else:
-            merged.append(tokens[i])
-            i += 1
-
-    # merge Mac + X
-    merged2: List[str] = []
-    i = 0
-    while i < len(merged):
-        if merged[i] == "Mac" and i + 1 < len(merged):
-            merged2.append("Mac" + merged[i + 1])
-            i += 2
-        else:
-            merged2.append(merged[i])
-            i += 1
-
-    return merged2
-
-
-
-def write_csv(path: Path, header: List[str], rows: List[Dict]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    if path.exists():
-        try:
-            path.unlink()
-        except Exception:
-            # fall back to truncating
-            pass
-    with path.open("w", newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=header)
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
-
+# CSV headers
+HEADER_A = ("team_index", "team_name") + tuple(f"p{i}" for i in range(1, DATASET_A_SQUAD_SIZE + 1))
+HEADER_B = ("team_index", "team_name") + tuple(f"p{i}" for i in range(1, DATASET_B_SQUAD_SIZE + 1))
+HEADER_ATTR = ("team_index", "team_name", "b1_u8", "u16_le", "b2_u8", "b3_u8", "b4_u8", "b4_ascii")
+HEADER_SOLVER = ("dataset", "kind", "offset", "scale", "mae", "min", "max")
 
 
 # ----------------------------
 # Team attribute extraction (raw)
 # ----------------------------
 
-def extract_team_attributes_raw(data: bytes, teams: List[str]) -> List[Dict]:
+def extract_team_attributes_raw(data: bytes, teams: List[str]) -> Iterator[Tuple]:
     """
     Dump several candidate per-team attribute fields.
     These offsets were discovered empirically; meaning is TBD.
+    Yields one positional row per team (at most TEAM_COUNT), in HEADER_ATTR
+    column order, so the rows can go straight to the CSV writer.
     """
-    rows: List[Dict] = []
-    for idx, name in enumerate(teams[:TEAM_COUNT]):
-        b1 = data[ATTR_B1_OFFSET + idx] if ATTR_B1_OFFSET + idx < len(data) else None
-        b2 = data[ATTR_B2_OFFSET + idx] if ATTR_B2_OFFSET + idx < len(data) else None
-        b3 = data[ATTR_B3_OFFSET + idx] if ATTR_B3_OFFSET + idx < len(data) else None
-        b4 = data[ATTR_B4_OFFSET + idx] if ATTR_B4_OFFSET + idx < len(data) else None
-
-        u16 = None
-        u16_off = ATTR_U16_OFFSET + idx * 2
-        if u16_off + 2 <= len(data):
-            u16 = struct.unpack_from("<H", data, u16_off)[0]
-
-        rows.append({
-            "team_index": idx,
-            "team_name": name,
-            "b1_u8": b1,
-            "u16_le": u16,
-            "b2_u8": b2,
-            "b3_u8": b3,
-            "b4_u8": b4,
-            "b4_ascii": chr(b4) if isinstance(b4, int) and 32 <= b4 <= 126 else "",
-        })
-    return rows
+    n = min(len(teams), TEAM_COUNT)
+
+    def column(vals) -> list:
+        # entries past the end of the file read as None
+        vals = list(vals)
+        return vals + [None] * (n - len(vals))
+
+    # one slice per byte table and one unpack for the u16 table
+    b1s = column(data[ATTR_B1_OFFSET : ATTR_B1_OFFSET + n])
+    b2s = column(data[ATTR_B2_OFFSET : ATTR_B2_OFFSET + n])
+    b3s = column(data[ATTR_B3_OFFSET : ATTR_B3_OFFSET + n])
+    b4s = column(data[ATTR_B4_OFFSET : ATTR_B4_OFFSET + n])
+    n16 = max(0, min(n, (len(data) - ATTR_U16_OFFSET) // 2))
+    u16s = column(struct.unpack_from(f"<{n16}H", data, ATTR_U16_OFFSET) if n16 else ())
+
+    for idx, (name, b1, u16, b2, b3, b4) in enumerate(zip(teams, b1s, u16s, b2s, b3s, b4s)):
+        yield (
+            idx,
+            name,
+            b1,
+            u16,
+            b2,
+            b3,
+            b4,
+            chr(b4) if isinstance(b4, int) and 32 <= b4 <= 126 else "",
+        )
 
 
 
@@ -252,11 +128,55 @@ def extract_team_attributes_raw(data: bytes, teams: List[str]) -> List[Dict]:
 # Numeric table solver (for decoding attributes like stadium capacity)
 # ----------------------------
 
-def _mean_abs_error(pred: List[int], truth: Dict[int, int]) -> float:
-    err = 0.0
-    for idx, val in truth.items():
-        err += abs(pred[idx] - val)
-    return err / max(1, len(truth))
+def _unpack_aligned(data: bytes, code: str, size: int) -> List[Tuple[int, ...]]:
+    """
+    Decode the whole buffer as little-endian words once per byte alignment, so
+    the solvers can slice any window out instead of unpacking it per offset:
+    the word at byte offset off is _unpack_aligned(...)[off % size][off // size].
+    Alignments past the end of a tiny buffer are skipped (unpack_from would raise).
+    """
+    out: List[Tuple[int, ...]] = []
+    for a in range(min(size, len(data) + 1)):
+        count = (len(data) - a) // size
+        out.append(struct.unpack_from(f"<{count}{code}", data, a))
+    return out
+
+def _window_extremes(vals: Sequence[int], n: int) -> Tuple[List[int], List[int]]:
+    """min(vals[j:j+n]) and max(vals[j:j+n]) for every j, in one pass (monotonic deques)."""
+    mins: List[int] = []
+    maxs: List[int] = []
+    lo: Deque[int] = deque()
+    hi: Deque[int] = deque()
+    for j, v in enumerate(vals):
+        while lo and vals[lo[-1]] >= v:
+            lo.pop()
+        lo.append(j)
+        while hi and vals[hi[-1]] <= v:
+            hi.pop()
+        hi.append(j)
+        if j >= n - 1:
+            if lo[0] <= j - n:
+                lo.popleft()
+            if hi[0] <= j - n:
+                hi.popleft()
+            mins.append(vals[lo[0]])
+            maxs.append(vals[hi[0]])
+    return mins, maxs
+
+def _ranked(scored: List[Tuple], limit: Optional[int]) -> List[Dict]:
+    """
+    Order (mae, kind, offset, scale, min, max) candidates by mae, keeping scan
+    order on ties, and build result dicts for the first `limit` only.
+    """
+    if limit is None:
+        best = sorted(scored, key=itemgetter(0))
+    else:
+        # same rows as sorted(...)[:limit], without sorting every candidate
+        best = heapq.nsmallest(limit, scored, key=itemgetter(0))
+    return [
+        {"kind": kind, "offset": off, "scale": k, "mae": mae, "min": lo, "max": hi}
+        for mae, kind, off, k, lo, hi in best
+    ]
 
 def solve_u16_scaled_tables(
     data: bytes,
@@ -266,35 +186,41 @@ def solve_u16_scaled_tables(
     search_start: int = 0,
     search_end: Optional[int] = None,
     step: int = 1,
+    limit: Optional[int] = None,
 ) -> List[Dict]:
-    """Scan for contiguous little-endian uint16 tables of length n (optionally scaled) and score vs truth anchors."""
+    """
+    Scan for contiguous little-endian uint16 tables of length n (optionally scaled) and score vs truth anchors.
+    Returns candidates best-first; pass limit to keep only the top ones.
+    """
     if search_end is None:
         search_end = len(data)
     byte_len = 2 * n
-    out: List[Dict] = []
+    scored: List[Tuple] = []
     end = min(search_end, len(data) - byte_len)
-    fmt = "<" + "H" * n
+    words = _unpack_aligned(data, "H", 2)
+    extremes = [_window_extremes(w, n) for w in words]
+    kinds = [(k, f"u16_x{k}") for k in scales]
+    # anchors hoisted out of the dict once; each window is then read at those
+    # indices a single time and the values are shared by every scale
+    truth_items = list(truth.items())
+    denom = max(1, len(truth))
     for off in range(search_start, end, step):
-        try:
-            vals = struct.unpack_from(fmt, data, off)
-        except Exception:
-            continue
-        mx = max(vals)
+        j = off // 2
+        mins, maxs = extremes[off % 2]
+        mx = maxs[j]
         if mx == 0:
             continue
-        for k in scales:
-            pred = [v * k for v in vals]
-            mae = _mean_abs_error(pred, truth)
-            out.append({
-                "kind": f"u16_x{k}",
-                "offset": off,
-                "scale": k,
-                "mae": mae,
-                "min": int(min(pred)),
-                "max": int(max(pred)),
-            })
-    out.sort(key=lambda r: r["mae"])
-    return out
+        # every scale reuses the one window: its extremes just scale with k
+        mn = mins[j]
+        w = words[off % 2]
+        pairs = [(w[j + i], t) for i, t in truth_items]
+        for k, kind in kinds:
+            err = 0
+            for v, t in pairs:
+                err += abs(v * k - t)
+            lo, hi = mn * k, mx * k
+            scored.append((err / denom, kind, off, k, min(lo, hi), max(lo, hi)))
+    return _ranked(scored, limit)
 
 def solve_u32_tables(
     data: bytes,
@@ -303,34 +229,33 @@ def solve_u32_tables(
     search_start: int = 0,
     search_end: Optional[int] = None,
     step: int = 1,
+    limit: Optional[int] = None,
 ) -> List[Dict]:
-    """Scan for contiguous little-endian uint32 tables of length n and score vs truth anchors."""
+    """
+    Scan for contiguous little-endian uint32 tables of length n and score vs truth anchors.
+    Returns candidates best-first; pass limit to keep only the top ones.
+    """
     if search_end is None:
         search_end = len(data)
     byte_len = 4 * n
-    out: List[Dict] = []
+    scored: List[Tuple] = []
     end = min(search_end, len(data) - byte_len)
-    fmt = "<" + "I" * n
+    words = _unpack_aligned(data, "I", 4)
+    extremes = [_window_extremes(w, n) for w in words]
+    truth_items = list(truth.items())
+    denom = max(1, len(truth))
     for off in range(search_start, end, step):
-        try:
-            vals = struct.unpack_from(fmt, data, off)
-        except Exception:
-            continue
-        mx = max(vals)
+        j = off // 4
+        mins, maxs = extremes[off % 4]
+        mx = maxs[j]
         if mx < 1000:
             continue
-        pred = list(vals)
-        mae = _mean_abs_error(pred, truth)
-        out.append({
-            "kind": "u32",
-            "offset": off,
-            "scale": 1,
-            "mae": mae,
-            "min": int(min(pred)),
-            "max": int(max(pred)),
-        })
-    out.sort(key=lambda r: r["mae"])
-    return out
+        w = words[off % 4]
+        err = 0
+        for i, t in truth_items:
+            err += abs(w[j + i] - t)
+        scored.append((err / denom, "u32", off, 1, mins[j], mx))
+    return _ranked(scored, limit)
 
 
 # ----------------------------
@@ -338,148 +263,140 @@ def solve_u32_tables(
 # ----------------------------
 
 def main(dat_path: str) -> int:
-    data = Path(dat_path).read_bytes()
-
-    # Team List A: first slot16 table (typically starts at offset 6)
-    tables = find_slot16_tables(data)
-    if not tables:
-        print("ERROR: No 16-byte slot string table found.")
-        return 2
-    team_table_a = tables[0]
-
-    teamsA = [name for _, name in team_table_a[:TEAM_COUNT]]
-    if len(teamsA) < TEAM_COUNT:
-        # pad if necessary
-        teamsA += [""] * (TEAM_COUNT - len(teamsA))
-
-    # Tokenise name blob
-    blob_text = data[PLAYER_BLOB_START:PLAYER_BLOB_END].decode("cp437", errors="ignore")
-    tokens = tokenize_mixed(blob_text)
-
-    # Dataset A squads (21 per team, aligned for indices >= 7)
-    def squadA(team_index: int) -> Optional[List[str]]:
-        t = team_index - DATASET_A_START_TEAM_INDEX
-        start = DATASET_A_TOKEN_OFFSET + t * DATASET_A_SQUAD_SIZE
-        end = start + DATASET_A_SQUAD_SIZE
-        if start < 0 or end > len(tokens):
-            return None
-        return tokens[start:end]
-
-    rowsA: List[Dict] = []
-    for idx, tname in enumerate(teamsA):
-        if idx < DATASET_A_START_TEAM_INDEX:
-            continue
-        sq = squadA(idx)
-        if not sq:
-            continue
-        rec = {"team_index": idx, "team_name": tname}
-        for i in range(DATASET_A_SQUAD_SIZE):
-            rec[f"p{i+1}"] = sq[i]
-        rowsA.append(rec)
-
-    output_dir = Path(dat_path).resolve().parent
-
-    outA = output_dir / "teamlist_A_21_squads.csv"
-    headerA = ["team_index", "team_name"] + [f"p{i+1}" for i in range(DATASET_A_SQUAD_SIZE)]
-    write_csv(outA, headerA, rowsA)
-
-    # Team List B: packed Pascal-ish strings in scan window
-    pas = extract_pascal_strings(data)
-    cand = [(off, s) for off, s in pas if TEAMLIST_B_SCAN_MIN <= off <= TEAMLIST_B_SCAN_MAX]
-
-    seen = set()
-    teamsB: List[Tuple[int, str]] = []
-    for off, s in cand:
-        key = s.lower()
-        if key in seen:
-            continue
-        if len(s) < 4:
-            continue
-        if any(k in s.upper() for k in ("LEAGUE", "DIVISION")):
-            continue
-        seen.add(key)
-        teamsB.append((off, s))
-
-    # Dataset B squads (16-name blocks from token offset 10)
-    blocksB: List[List[str]] = []
-    for bstart in range(DATASET_B_TOKEN_OFFSET, len(tokens), DATASET_B_SQUAD_SIZE):
-        bend = bstart + DATASET_B_SQUAD_SIZE
-        if bend > len(tokens):
-            break
-        blk = tokens[bstart:bend]
-        ok = sum(1 for t in blk if NAME_TOKEN_RE.fullmatch(t)) >= 12
-        if ok:
-            blocksB.append(blk)
-
-    rowsB: List[Dict] = []
-    for i, (_, name) in enumerate(teamsB):
-        if i >= len(blocksB):
-            break
-        blk = blocksB[i]
-        rec = {"team_index": i, "team_name": name}
-        for j in range(DATASET_B_SQUAD_SIZE):
-            rec[f"p{j+1}"] = blk[j]
-        rowsB.append(rec)
-
-    outB = output_dir / "teamlist_B_16_squads.csv"
-    headerB = ["team_index", "team_name"] + [f"p{i+1}" for i in range(DATASET_B_SQUAD_SIZE)]
-    write_csv(outB, headerB, rowsB)
-
-    # Optional: try to solve stadium capacity tables using known anchors.
-    # Run with: python scot94_extract_with_attrs_and_solver.py SCOT-94.DAT --solve-capacity
-    if "--solve-capacity" in sys.argv:
-        # Dataset A anchors (team indices in the 64-team list)
-        truthA = {
-            30: 30000,  # Seraing
-            22: 44000,  # AS Roma
-            15: 44000,  # Kaiserslautern
-            38: 86000,  # AC Milan
-            36: 83000,  # Lazio
-        }
-
-        # Dataset B anchors (indices in extracted Team List B ordering)
-        truthB: Dict[int, int] = {}
-        name_to_idxB = {name.upper(): i for i, (_, name) in enumerate(teamsB)}
-        for nm, cap in [("Parma", 42000), ("Aberdeen", 22000), ("Dundee", 16000), ("Falkirk", 14000)]:
-            if nm.upper() in name_to_idxB:
-                truthB[name_to_idxB[nm.upper()]] = cap
-
-        scales = [1, 2, 4, 5, 10, 20, 25, 50, 100]
-
-        candA = solve_u16_scaled_tables(data, TEAM_COUNT, truthA, scales, step=1)
-        candA32 = solve_u32_tables(data, TEAM_COUNT, truthA, step=1)
-        topA = (candA[:25] + candA32[:25])
-        topA.sort(key=lambda r: r["mae"])
-
-        topB: List[Dict] = []
-        if len(truthB) >= 3 and len(teamsB) >= 20:
-            nB = len(teamsB)
-            candB = solve_u16_scaled_tables(data, nB, truthB, scales, step=1)
-            candB32 = solve_u32_tables(data, nB, truthB, step=1)
-            topB = (candB[:25] + candB32[:25])
-            topB.sort(key=lambda r: r["mae"])
-
-        solver_out = output_dir / "capacity_solver_candidates.csv"
-        rows: List[Dict] = []
-        for r in topA[:20]:
-            rows.append({"dataset": "A", **r})
-        for r in topB[:20]:
-            rows.append({"dataset": "B", **r})
-
-        write_csv(solver_out, ["dataset", "kind", "offset", "scale", "mae", "min", "max"], rows)
-        print(f"Wrote: {solver_out} (rows={len(rows)})")
-
-
-    # NEW: Team attributes (raw dump)
-    attr_rows = extract_team_attributes_raw(data, teamsA)
-    outAttr = output_dir / "team_attributes_raw.csv"
-    headerAttr = ["team_index", "team_name", "b1_u8", "u16_le", "b2_u8", "b3_u8", "b4_u8", "b4_ascii"]
-    write_csv(outAttr, headerAttr, attr_rows)
-
-    print(f"Wrote: {outA} (rows={len(rowsA)})")
-    print(f"Wrote: {outB} (rows={len(rowsB)})")
-    print(f"Wrote: {outAttr} (rows={len(attr_rows)})")
-    return 0
+    # the mapping is closed when main returns, not left for the GC
+    with mopen(dat_path) as data:
+        # Team List A: first slot16 table (typically starts at offset 6)
+        team_table_a = find_first_slot16_table(data)
+        if team_table_a is None:
+            print("ERROR: No 16-byte slot string table found.")
+            return 2
+
+        teamsA = [name for _, name in team_table_a[:TEAM_COUNT]]
+        if len(teamsA) < TEAM_COUNT:
+            # pad if necessary
+            teamsA += [""] * (TEAM_COUNT - len(teamsA))
+
+        # Tokenise name blob
+        # decode straight from the mapping; slicing data first would copy the blob
+        blob_text = str(memoryview(data)[PLAYER_BLOB_START:PLAYER_BLOB_END], "cp437", errors="ignore")
+        tokens = tokenize_mixed(blob_text)
+
+        # Dataset A squads (21 per team, aligned for indices >= 7)
+        def squadA(team_index: int) -> Optional[List[str]]:
+            t = team_index - DATASET_A_START_TEAM_INDEX
+            start = DATASET_A_TOKEN_OFFSET + t * DATASET_A_SQUAD_SIZE
+            end = start + DATASET_A_SQUAD_SIZE
+            if start < 0 or end > len(tokens):
+                return None
+            return tokens[start:end]
+
+        output_dir = Path(dat_path).resolve().parent
+
+        outA = output_dir / "teamlist_A_21_squads.csv"
+        rowsA = 0
+        with open_csv(outA, HEADER_A) as w:
+            for idx, tname in enumerate(teamsA):
+                if idx < DATASET_A_START_TEAM_INDEX:
+                    continue
+                sq = squadA(idx)
+                if not sq:
+                    continue
+                w.writerow([idx, tname, *sq])
+                rowsA += 1
+
+        # Team List B: packed Pascal-ish strings in scan window
+        # only strings starting inside the window are produced; nothing past it is scanned
+        cand = extract_pascal_strings(data, start=TEAMLIST_B_SCAN_MIN, stop=TEAMLIST_B_SCAN_MAX + 1)
+
+        seen = set()
+        teamsB: List[Tuple[int, str]] = []
+        for off, s in cand:
+            key = s.lower()
+            if key in seen:
+                continue
+            if len(s) < 4:
+                continue
+            if any(k in s.upper() for k in ("LEAGUE", "DIVISION")):
+                continue
+            seen.add(key)
+            teamsB.append((off, s))
+
+        # Dataset B squads (16-name blocks from token offset 10)
+        blocksB: List[List[str]] = []
+        # one regex pass over the tokens into a 0/1 bitmap; each block then just
+        # counts its ones with bytes.count, without slicing
+        is_name = bytes(NAME_TOKEN_RE.fullmatch(t) is not None for t in tokens)
+        for bstart in range(DATASET_B_TOKEN_OFFSET, len(tokens), DATASET_B_SQUAD_SIZE):
+            bend = bstart + DATASET_B_SQUAD_SIZE
+            if bend > len(tokens):
+                break
+            ok = is_name.count(1, bstart, bend) >= 12
+            if ok:
+                blocksB.append(tokens[bstart:bend])
+
+        outB = output_dir / "teamlist_B_16_squads.csv"
+        rowsB = 0
+        with open_csv(outB, HEADER_B) as w:
+            for i, (_, name) in enumerate(teamsB):
+                if i >= len(blocksB):
+                    break
+                w.writerow([i, name, *blocksB[i]])
+                rowsB += 1
+
+        # Optional: try to solve stadium capacity tables using known anchors.
+        # Run with: python scot94_extract_with_attrs_and_solver.py SCOT-94.DAT --solve-capacity
+        if "--solve-capacity" in sys.argv:
+            # Dataset A anchors (team indices in the 64-team list)
+            truthA = {
+                30: 30000,  # Seraing
+                22: 44000,  # AS Roma
+                15: 44000,  # Kaiserslautern
+                38: 86000,  # AC Milan
+                36: 83000,  # Lazio
+            }
+
+            # Dataset B anchors (indices in extracted Team List B ordering)
+            truthB: Dict[int, int] = {}
+            name_to_idxB = {name.upper(): i for i, (_, name) in enumerate(teamsB)}
+            for nm, cap in [("Parma", 42000), ("Aberdeen", 22000), ("Dundee", 16000), ("Falkirk", 14000)]:
+                if nm.upper() in name_to_idxB:
+                    truthB[name_to_idxB[nm.upper()]] = cap
+
+            scales = [1, 2, 4, 5, 10, 20, 25, 50, 100]
+
+            candA = solve_u16_scaled_tables(data, TEAM_COUNT, truthA, scales, step=1, limit=25)
+            candA32 = solve_u32_tables(data, TEAM_COUNT, truthA, step=1, limit=25)
+            topA = (candA + candA32)
+            topA.sort(key=lambda r: r["mae"])
+
+            topB: List[Dict] = []
+            if len(truthB) >= 3 and len(teamsB) >= 20:
+                nB = len(teamsB)
+                candB = solve_u16_scaled_tables(data, nB, truthB, scales, step=1, limit=25)
+                candB32 = solve_u32_tables(data, nB, truthB, step=1, limit=25)
+                topB = (candB + candB32)
+                topB.sort(key=lambda r: r["mae"])
+
+            solver_out = output_dir / "capacity_solver_candidates.csv"
+            rows = [
+                (dataset, r["kind"], r["offset"], r["scale"], r["mae"], r["min"], r["max"])
+                for dataset, top in (("A", topA), ("B", topB))
+                for r in top[:20]
+            ]
+
+            write_csv(solver_out, HEADER_SOLVER, rows)
+            print(f"Wrote: {solver_out} (rows={len(rows)})")
+
+
+        # NEW: Team attributes (raw dump)
+        outAttr = output_dir / "team_attributes_raw.csv"
+        write_csv(outAttr, HEADER_ATTR, extract_team_attributes_raw(data, teamsA))
+
+        print(f"Wrote: {outA} (rows={rowsA})")
+        print(f"Wrote: {outB} (rows={rowsB})")
+        # one attribute row per team; teamsA is padded/truncated to TEAM_COUNT
+        print(f"Wrote: {outAttr} (rows={len(teamsA)})")
+        return 0
 
 
 if __name__ == "__main__":
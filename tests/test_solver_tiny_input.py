@@ -0,0 +1,35 @@
+import sys
+import unittest
+from pathlib import Path
+
+# the scripts in src/app import each other as top-level modules
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src" / "app"))
+
+import find_capacity_tables  # noqa: E402
+import scot94_extract_with_attrs_and_solver as solver  # noqa: E402
+
+
+class TinyInputTest(unittest.TestCase):
+    """Buffers shorter than one word must yield no candidates, not raise."""
+
+    def test_u16_solver(self):
+        for size in range(0, 6):
+            data = bytes(range(1, size + 1))
+            self.assertEqual(solver.solve_u16_scaled_tables(data, 4, {0: 1}, [1, 2]), [])
+
+    def test_u32_solver(self):
+        for size in range(0, 6):
+            data = bytes(range(1, size + 1))
+            self.assertEqual(solver.solve_u32_tables(data, 4, {0: 1}), [])
+
+    def test_unpack_aligned(self):
+        self.assertEqual(solver._unpack_aligned(b"", "I", 4), [()])
+        self.assertEqual(solver._unpack_aligned(b"\x01\x00", "H", 2), [(1,), ()])
+
+    def test_find_capacity_tables(self):
+        for size in range(0, 6):
+            self.assertEqual(find_capacity_tables.find_candidates(bytes(size)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()